@@ -1,7 +1,7 @@
 """Configuration settings for the application."""
 
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 
 @dataclass
@@ -11,6 +11,17 @@ class SearchConfig:
     model_path: str = './models'
     similarity_threshold: float = 0.1
     max_results: int = 5
+    max_suggestions: int = 8
+    suggest_min_query_count: int = 3
+    suggest_max_queries: int = 500
+    encode_max_tokens_per_batch: int = 8192
+    encode_min_batch_size: int = 8
+    encode_max_batch_size: int = 256
+    encode_chunk_size: int = 4096
+    encode_processes: int = 1
+    encode_checkpoint_dir: Optional[str] = None
+    compaction_ratio: float = 0.25
+    compaction_min_rows: int = 256
 
 
 @dataclass
@@ -24,6 +35,14 @@ class DataConfig:
             self.required_columns = ['Tool', 'Action', 'Summary', 'Confluence Link']
 
 
+@dataclass
+class QueryLogConfig:
+    """Query log configuration."""
+    enabled: bool = False
+    path: str = "logs/queries.jsonl"
+    max_pending: int = 10000
+
+
 @dataclass
 class UIConfig:
     """UI configuration."""
@@ -39,6 +58,7 @@ class AppConfig:
     search: SearchConfig = None
     data: DataConfig = None
     ui: UIConfig = None
+    query_log: QueryLogConfig = None
     
     def __post_init__(self):
         if self.search is None:
@@ -46,4 +66,6 @@ class AppConfig:
         if self.data is None:
             self.data = DataConfig()
         if self.ui is None:
-            self.ui = UIConfig()
\ No newline at end of file
+            self.ui = UIConfig()
+        if self.query_log is None:
+            self.query_log = QueryLogConfig()
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""Length-bucketed bulk encoding pipeline for index builds."""
+
+import hashlib
+import json
+import os
+import numpy as np
+from typing import List
+from config import SearchConfig
+
+
+class BulkEncoder:
+    """Encodes large text collections into a preallocated float32 array.
+
+    Texts are sorted by token length so each batch pads to a similar length,
+    and batch sizes are chosen from a per-batch token budget. Work is done in
+    chunks; with a checkpoint directory, finished chunks are kept on disk so an
+    interrupted build resumes where it stopped.
+    """
+
+    def __init__(self, model, config: SearchConfig):
+        self.model = model
+        self.config = config
+        self.max_tokens_per_batch = config.encode_max_tokens_per_batch
+        self.min_batch_size = config.encode_min_batch_size
+        self.max_batch_size = config.encode_max_batch_size
+        self.processes = config.encode_processes
+        self.checkpoint_dir = config.encode_checkpoint_dir
+        self.chunk_size = config.encode_chunk_size
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts, returning embeddings in the original order."""
+        dimension = self.model.get_sentence_embedding_dimension()
+        if not texts:
+            return np.empty((0, dimension), dtype=np.float32)
+
+        lengths = self._token_lengths(texts)
+        order = np.argsort(lengths, kind='stable')
+        embeddings, done = self._open_output(texts, dimension)
+        if done:
+            print(f"Resuming encoding from checkpoint: {done}/{len(texts)} texts already encoded")
+
+        pool = self._start_pool(len(texts) - done)
+        try:
+            for start in range(done, len(texts), self.chunk_size):
+                indices = order[start:start + self.chunk_size]
+                chunk = [texts[i] for i in indices]
+                batch_size = self._batch_size(int(lengths[indices[-1]]))
+                embeddings[indices] = self._encode_chunk(chunk, batch_size, pool)
+                self._save_progress(embeddings, start + len(indices))
+                print(f"Encoded {start + len(indices)}/{len(texts)} texts (batch size {batch_size})")
+        finally:
+            if pool is not None:
+                self.model.stop_multi_process_pool(pool)
+
+        return self._finish(embeddings)
+
+    def _token_lengths(self, texts: List[str]) -> np.ndarray:
+        """Count tokens per text, capped at the model's max sequence length."""
+        max_length = self.model.max_seq_length
+        tokenizer = getattr(self.model, 'tokenizer', None)
+        if tokenizer is None:
+            return np.array([min(len(text.split()), max_length) for text in texts])
+
+        encoded = tokenizer(texts, truncation=True, max_length=max_length)
+        return np.array([len(ids) for ids in encoded['input_ids']])
+
+    def _batch_size(self, max_tokens: int) -> int:
+        """Pick a batch size so padded batches stay within the token budget."""
+        batch_size = self.max_tokens_per_batch // max(max_tokens, 1)
+        return int(min(max(batch_size, self.min_batch_size), self.max_batch_size))
+
+    def _start_pool(self, remaining: int):
+        """Start a CPU multi-process pool when it is configured and worthwhile."""
+        if self.processes <= 1 or remaining < self.processes * self.max_batch_size:
+            return None
+        if self.model.device.type != 'cpu':
+            return None
+
+        print(f"Starting {self.processes} encoding processes...")
+        return self.model.start_multi_process_pool(target_devices=['cpu'] * self.processes)
+
+    def _encode_chunk(self, chunk: List[str], batch_size: int, pool) -> np.ndarray:
+        """Encode one length-sorted chunk of texts."""
+        if pool is not None:
+            # Split work so each process receives whole, similarly padded batches
+            per_process = -(-len(chunk) // self.processes)
+            chunk_size = max(batch_size, -(-per_process // batch_size) * batch_size)
+            return self.model.encode_multi_process(
+                chunk, pool, batch_size=batch_size, chunk_size=chunk_size
+            )
+
+        return self.model.encode(
+            chunk,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+
+    def _open_output(self, texts: List[str], dimension: int):
+        """Allocate the output array, reusing a matching checkpoint if present."""
+        shape = (len(texts), dimension)
+        if not self.checkpoint_dir:
+            return np.empty(shape, dtype=np.float32), 0
+
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        fingerprint = self._fingerprint(texts)
+        progress = self._load_progress()
+
+        if progress.get('fingerprint') == fingerprint and os.path.exists(self._array_path):
+            embeddings = np.lib.format.open_memmap(self._array_path, mode='r+')
+            if embeddings.shape == shape and embeddings.dtype == np.float32:
+                self._progress = progress
+                return embeddings, int(progress.get('done', 0))
+
+        embeddings = np.lib.format.open_memmap(
+            self._array_path, mode='w+', dtype=np.float32, shape=shape
+        )
+        self._progress = {'fingerprint': fingerprint, 'done': 0}
+        self._save_progress(embeddings, 0)
+        return embeddings, 0
+
+    def _save_progress(self, embeddings: np.ndarray, done: int):
+        """Flush encoded rows and record how many sorted texts are finished."""
+        if not self.checkpoint_dir:
+            return
+
+        embeddings.flush()
+        self._progress['done'] = done
+        tmp_path = self._progress_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._progress, f)
+        os.replace(tmp_path, self._progress_path)
+
+    def _load_progress(self) -> dict:
+        """Read checkpoint progress, treating unreadable files as absent."""
+        try:
+            with open(self._progress_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _finish(self, embeddings: np.ndarray) -> np.ndarray:
+        """Return an in-memory array and clear a completed checkpoint."""
+        if not self.checkpoint_dir:
+            return embeddings
+
+        result = np.array(embeddings)
+        del embeddings
+        for path in (self._array_path, self._progress_path):
+            if os.path.exists(path):
+                os.remove(path)
+        return result
+
+    def _fingerprint(self, texts: List[str]) -> str:
+        """Identify the model and corpus a checkpoint belongs to."""
+        digest = hashlib.sha1(self.config.model_name.encode('utf-8'))
+        for text in texts:
+            digest.update(text.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    @property
+    def _array_path(self) -> str:
+        return os.path.join(self.checkpoint_dir, 'embeddings.npy')
+
+    @property
+    def _progress_path(self) -> str:
+        return os.path.join(self.checkpoint_dir, 'progress.json')
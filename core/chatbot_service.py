@@ -3,8 +3,10 @@
 from .data_loader import DataLoader
 from .search_engine import SearchEngine
 from .formatter import ResultFormatter
+from .query_log import QueryLogger
 from config import AppConfig
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import time
 
 
 class ChatbotService:
@@ -15,6 +17,7 @@ class ChatbotService:
         self.data_loader = DataLoader(self.config.data)
         self.search_engine = SearchEngine(self.config.search)
         self.formatter = ResultFormatter()
+        self.query_logger = QueryLogger(self.config.query_log) if self.config.query_log.enabled else None
         self._initialize()
     
     def _initialize(self):
@@ -43,9 +46,26 @@ class ChatbotService:
             top_k = self.config.search.max_results
         
         # Perform search
+        arrived = time.time()
+        start = time.perf_counter()
         results = self.search_engine.search(query.strip(), top_k, self.config.search.similarity_threshold)
+        if self.query_logger is not None:
+            latency_ms = (time.perf_counter() - start) * 1000
+            self.query_logger.log(arrived, query.strip(), top_k, latency_ms, len(results))
+        if results:
+            self.search_engine.record_query(query.strip())
         return self.formatter.format_search_results(results, query)
     
+    def suggest(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Get type-ahead suggestions for a partial query."""
+        if not prefix or not prefix.strip():
+            return []
+        
+        if limit is None:
+            limit = self.config.search.max_suggestions
+        
+        return self.search_engine.suggest(prefix, limit)
+    
     def get_status(self) -> Dict[str, Any]:
         """Get current system status."""
         return self.search_engine.get_status()
@@ -55,6 +75,22 @@ class ChatbotService:
         status = self.get_status()
         return status.get('record_count', 0)
     
+    def upsert(self, records: List[Dict[str, Any]]) -> int:
+        """Add or replace records keyed by (Tool, Action) without a rebuild."""
+        data = self.data_loader.prepare_records(records)
+        if data is None:
+            return 0
+        return self.search_engine.upsert(data)
+    
+    def delete(self, keys: Iterable[Tuple[str, str]]) -> int:
+        """Delete records by (Tool, Action) without a rebuild."""
+        return self.search_engine.delete(keys)
+    
     def reload_data(self):
         """Reload data from files."""
-        self._initialize()
\ No newline at end of file
+        self._initialize()
+    
+    def close(self):
+        """Flush the query log, if enabled."""
+        if self.query_logger is not None:
+            self.query_logger.close()
\ No newline at end of file
@@ -2,7 +2,7 @@
 
 import pandas as pd
 import glob
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from config import DataConfig
 
 
@@ -40,9 +40,7 @@ class DataLoader:
                 print(f"WARNING: {file_path} missing columns: {missing_columns}")
                 return None
             
-            # Clean data
-            for col in self.required_columns:
-                df[col] = df[col].astype(str).str.strip()
+            self._clean(df)
             
             print(f"✓ Loaded {len(df)} records from {file_path}")
             return df
@@ -62,11 +60,31 @@ class DataLoader:
         if initial_count != final_count:
             print(f"Removed {initial_count - final_count} duplicate entries")
         
-        # Create searchable text
-        combined_df['searchable_text'] = (
-            combined_df['Tool'].astype(str) + ' ' + 
-            combined_df['Action'].astype(str) + ' ' + 
-            combined_df['Summary'].astype(str)
-        )
+        self._add_searchable_text(combined_df)
+        return combined_df
+    
+    def prepare_records(self, records: List[Dict[str, Any]]) -> Optional[pd.DataFrame]:
+        """Validate and clean individual records for an incremental update."""
+        df = pd.DataFrame(records, columns=self.required_columns)
+        if df.isnull().any().any():
+            print(f"ERROR: Records must include all columns: {self.required_columns}")
+            return None
         
-        return combined_df
\ No newline at end of file
+        self._clean(df)
+        df = df.drop_duplicates(subset=['Tool', 'Action'], keep='last').reset_index(drop=True)
+        self._add_searchable_text(df)
+        return df
+    
+    def _clean(self, df: pd.DataFrame):
+        """Normalize required columns to stripped strings in place."""
+        for col in self.required_columns:
+            df[col] = df[col].astype(str).str.strip()
+    
+    @staticmethod
+    def _add_searchable_text(df: pd.DataFrame):
+        """Create the text that is embedded for semantic search."""
+        df['searchable_text'] = (
+            df['Tool'].astype(str) + ' ' + 
+            df['Action'].astype(str) + ' ' + 
+            df['Summary'].astype(str)
+        )
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""Growable embedding storage for incremental index updates."""
+
+import numpy as np
+from typing import Tuple
+
+
+class EmbeddingBuffer:
+    """Append-only float32 embedding rows with a per-row live flag.
+
+    Capacity doubles when full, so appends cost amortized O(rows added).
+    Deleted rows are tombstoned by clearing their live flag.
+    """
+
+    def __init__(self, dimension: int, capacity: int = 64):
+        self.vectors = np.empty((capacity, dimension), dtype=np.float32)
+        self.live = np.zeros(capacity, dtype=bool)
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, vectors: np.ndarray) -> np.ndarray:
+        """Append rows as live and return their positions."""
+        count = len(vectors)
+        self._reserve(self.size + count)
+
+        positions = np.arange(self.size, self.size + count)
+        self.vectors[positions] = vectors
+        self.live[positions] = True
+        self.size += count
+        return positions
+
+    def view(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the used portion of the vectors and live flags."""
+        return self.vectors[:self.size], self.live[:self.size]
+
+    def _reserve(self, required: int):
+        """Grow storage to hold at least the required number of rows."""
+        capacity = len(self.vectors)
+        if required <= capacity:
+            return
+
+        capacity = max(capacity, 1)
+        while capacity < required:
+            capacity *= 2
+
+        vectors = np.empty((capacity, self.vectors.shape[1]), dtype=np.float32)
+        vectors[:self.size] = self.vectors[:self.size]
+        live = np.zeros(capacity, dtype=bool)
+        live[:self.size] = self.live[:self.size]
+        self.vectors = vectors
+        self.live = live
@@ -0,0 +1,121 @@
+"""Asynchronous JSONL query log for capturing production traffic."""
+
+import atexit
+import json
+import os
+import queue
+import threading
+from typing import Any, Dict, Iterator, List
+from config import QueryLogConfig
+
+
+_STOP = object()
+
+
+class QueryLogger:
+    """Writes query log entries to a JSONL file on a background thread.
+
+    Logging only enqueues a small dict, so the search path never waits on
+    disk I/O. Entries are dropped rather than blocking when the queue is full.
+    """
+
+    def __init__(self, config: QueryLogConfig):
+        self.config = config
+        self.path = config.path
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=config.max_pending)
+        self._thread = threading.Thread(target=self._run, name="query-log-writer", daemon=True)
+        self._closed = False
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Open here so a bad path fails at startup rather than in the writer
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, ts: float, query: str, top_k: int, latency_ms: float, result_count: int):
+        """Queue a query log entry for writing.
+
+        ``ts`` is the wall-clock time the query arrived, so replays follow
+        the original arrival timeline rather than completion times.
+        """
+        if self._closed or not self._thread.is_alive():
+            self.dropped += 1
+            return
+
+        entry = {
+            'ts': ts,
+            'query': query,
+            'top_k': top_k,
+            'latency_ms': round(latency_ms, 3),
+            'result_count': result_count
+        }
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """Flush pending entries and stop the writer thread."""
+        if self._closed:
+            return
+
+        self._closed = True
+        if self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=5)
+            except queue.Full:
+                print("WARNING: Query log writer is not draining; pending entries are lost")
+            self._thread.join(timeout=5)
+        if self.dropped:
+            print(f"WARNING: Query log dropped {self.dropped} entries")
+
+    def _run(self):
+        """Drain the queue in batches and append entries to the log file."""
+        try:
+            with self._file as log_file:
+                self._drain(log_file)
+        except Exception as e:
+            print(f"ERROR: Query log writer stopped: {str(e)}")
+
+    def _drain(self, log_file):
+        """Write queued entries until the stop marker is received."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < 1000:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(entry is _STOP for entry in batch)
+            lines = [json.dumps(entry) + '\n' for entry in batch if entry is not _STOP]
+            if lines:
+                log_file.writelines(lines)
+                log_file.flush()
+            if stop:
+                return
+
+
+def read_query_log(path: str) -> List[Dict[str, Any]]:
+    """Load query log entries ordered by timestamp."""
+    return sorted(_iter_entries(path), key=lambda entry: entry['ts'])
+
+
+def _iter_entries(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield valid entries from a JSONL query log, skipping bad lines."""
+    with open(path, 'r', encoding='utf-8') as log_file:
+        for line_number, line in enumerate(log_file, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"WARNING: Skipping malformed line {line_number} in {path}")
+                continue
+            if 'ts' in entry and 'query' in entry:
+                yield entry
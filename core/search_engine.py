@@ -1,11 +1,17 @@
 """Semantic search engine module."""
 
 from sentence_transformers import SentenceTransformer
+import numpy as np
 import pandas as pd
+import inspect
 import os
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 from config import SearchConfig
 from .search_strategies import SearchStrategy, CosineSimilarityStrategy
+from .suggest_index import PrefixIndex, PopularQueries
+from .bulk_encoder import BulkEncoder
+from .embedding_buffer import EmbeddingBuffer
 
 
 class SearchEngine:
@@ -18,7 +24,16 @@ class SearchEngine:
         self.model = None
         self.embeddings = None
         self.data = None
+        self.suggest_index = PrefixIndex()
+        self.popular_queries = PopularQueries(
+            self.suggest_index, config.suggest_min_query_count, config.suggest_max_queries
+        )
         self.search_strategy = search_strategy or CosineSimilarityStrategy()
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()
+        self._change_log = None
+        self._generation = 0
+        self._compacting = False
         self._load_model()
     
     def _load_model(self):
@@ -38,16 +53,225 @@ class SearchEngine:
             print("ERROR: No data to index")
             return
         
-        self.data = data
+        self._build_suggest_index(data)
         print("Generating embeddings for semantic search...")
         
-        self.embeddings = self.model.encode(
-            data['searchable_text'].tolist(),
-            show_progress_bar=True
+        embeddings = BulkEncoder(self.model, self.config).encode(
+            data['searchable_text'].tolist()
         )
+        self._reset_index(data, embeddings)
         
         print(f"✓ Successfully indexed {len(data)} records")
     
+    def _reset_index(self, data: pd.DataFrame, embeddings: np.ndarray):
+        """Replace the whole index with freshly encoded data."""
+        with self._lock:
+            self._generation += 1
+            self.data = data
+            self.embeddings = embeddings
+            self._live = np.ones(len(data), dtype=bool)
+            self._delta = EmbeddingBuffer(embeddings.shape[1])
+            self._delta_data = data.iloc[0:0]
+            self._keys = {key: row for row, key in enumerate(self._record_keys(data))}
+            self._dead = 0
+            self._change_log = None
+    
+    def upsert(self, records: pd.DataFrame) -> int:
+        """Insert or replace records keyed by (Tool, Action).
+        
+        Only the given records are encoded. They are appended to the delta
+        buffer and any previous version of each key is tombstoned.
+        """
+        if records is None or records.empty:
+            return 0
+        
+        records = records.drop_duplicates(subset=['Tool', 'Action'], keep='last')
+        vectors = self.model.encode(
+            records['searchable_text'].tolist(),
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        keys = self._record_keys(records)
+        
+        with self._lock:
+            if self.data is None:
+                self._reset_index(records.iloc[0:0], np.empty((0, vectors.shape[1]), dtype=np.float32))
+            
+            for key in keys:
+                self._tombstone(key)
+            
+            positions = self._delta.append(vectors)
+            if len(self._delta_data):
+                self._delta_data = pd.concat([self._delta_data, records], ignore_index=True)
+            else:
+                self._delta_data = records.reset_index(drop=True)
+            
+            base_size = len(self.data)
+            for key, position in zip(keys, positions):
+                self._keys[key] = base_size + int(position)
+            
+            # Under the lock so suggestion adds and removes follow tombstone order
+            self._add_suggestions(records)
+        
+        self._maybe_compact()
+        return len(records)
+    
+    def delete(self, keys: Iterable[Tuple[str, str]]) -> int:
+        """Tombstone records by (Tool, Action) and return how many were removed."""
+        with self._lock:
+            if self.data is None:
+                return 0
+            deleted = sum(self._tombstone((str(tool).strip(), str(action).strip()))
+                          for tool, action in keys)
+        
+        self._maybe_compact()
+        return deleted
+    
+    def compact(self):
+        """Merge appended rows into the main index and drop tombstoned rows.
+        
+        The new arrays and key map are built without holding the lock, so
+        searches and writes continue meanwhile. Keys written during the build
+        are recorded in a change log and reconciled when the result is
+        swapped in, so the final step only costs O(changes + new rows).
+        """
+        with self._compact_lock:
+            self._compact()
+    
+    def _compact(self):
+        """Run one compaction; callers must hold the compaction lock."""
+        with self._lock:
+            if self.data is None:
+                return
+            generation = self._generation
+            base_size = len(self.data)
+            cut = len(self._delta)
+            data, embeddings = self.data, self.embeddings
+            delta_data = self._delta_data
+            delta_vectors, delta_live = self._delta.view()
+            origins = np.flatnonzero(np.concatenate([self._live, delta_live]))
+            self._change_log = []
+        
+        base_rows = origins[origins < base_size]
+        delta_rows = origins[origins >= base_size] - base_size
+        new_data = pd.concat([data.iloc[base_rows], delta_data.iloc[delta_rows]], ignore_index=True)
+        new_embeddings = np.vstack([embeddings[base_rows], delta_vectors[delta_rows]])
+        keys = {key: row for row, key in enumerate(self._record_keys(new_data))}
+        new_live = np.ones(len(new_data), dtype=bool)
+        
+        with self._lock:
+            changed, self._change_log = self._change_log, None
+            if generation != self._generation:
+                return
+            
+            # Any write to a key since the snapshot tombstoned its snapshot
+            # row and, for upserts, appended the new version after the cut
+            old_tail_start = base_size + cut
+            for key in set(changed):
+                row = keys.pop(key, None)
+                if row is not None:
+                    new_live[row] = False
+                current = self._keys.get(key)
+                if current is not None:
+                    keys[key] = current - old_tail_start + len(new_data)
+            
+            # Rows appended since the snapshot stay in the delta buffer
+            tail_vectors, tail_live = self._delta.view()
+            tail = EmbeddingBuffer(new_embeddings.shape[1], max(len(tail_vectors) - cut, 64))
+            positions = tail.append(tail_vectors[cut:])
+            tail.live[positions] = tail_live[cut:]
+            
+            # Keep the old structures alive until the lock is released so
+            # freeing them does not extend the time searches are blocked
+            retired = (self.data, self.embeddings, self._live, self._delta,
+                       self._delta_data, self._keys)
+            self._generation += 1
+            self.data = new_data
+            self.embeddings = new_embeddings
+            self._live = new_live
+            self._delta = tail
+            self._delta_data = self._delta_data.iloc[cut:].reset_index(drop=True)
+            self._keys = keys
+            self._dead = int((~new_live).sum()) + int((~tail.live[:len(tail)]).sum())
+        
+        del retired
+        print(f"✓ Compacted index to {len(new_data)} records")
+    
+    def _maybe_compact(self):
+        """Start background compaction once enough garbage has built up."""
+        with self._lock:
+            garbage = self._dead + len(self._delta)
+            limit = max(self.config.compaction_min_rows,
+                        self.config.compaction_ratio * len(self.data))
+            if self._compacting or garbage < limit:
+                return
+            self._compacting = True
+        
+        threading.Thread(target=self._run_compaction, name="index-compaction", daemon=True).start()
+    
+    def _run_compaction(self):
+        """Run compaction on a background thread."""
+        try:
+            self.compact()
+        except Exception as e:
+            print(f"Compaction error: {str(e)}")
+        finally:
+            with self._lock:
+                self._compacting = False
+    
+    def _tombstone(self, key: Tuple[str, str]) -> bool:
+        """Mark the current row for a key as deleted."""
+        if self._change_log is not None:
+            self._change_log.append(key)
+        
+        row = self._keys.pop(key, None)
+        if row is None:
+            return False
+        
+        base_size = len(self.data)
+        if row < base_size:
+            self._live[row] = False
+        else:
+            self._delta.live[row - base_size] = False
+        self._dead += 1
+        self._remove_suggestions(key)
+        return True
+    
+    @staticmethod
+    def _record_keys(data: pd.DataFrame) -> List[Tuple[str, str]]:
+        """Return the (Tool, Action) key of each row."""
+        return list(zip(data['Tool'].astype(str), data['Action'].astype(str)))
+    
+    def _add_suggestions(self, data: pd.DataFrame):
+        """Add tool names and action phrases of new records to the suggestion index."""
+        for tool, action in self._record_keys(data):
+            self.suggest_index.add(tool)
+            self.suggest_index.add(action)
+            self.suggest_index.add(f"{tool} {action}")
+    
+    def _remove_suggestions(self, key: Tuple[str, str]):
+        """Withdraw a deleted record's weight from the suggestion index."""
+        tool, action = key
+        self.suggest_index.remove(tool, 1)
+        self.suggest_index.remove(action, 1)
+        self.suggest_index.remove(f"{tool} {action}", 1)
+    
+    def _build_suggest_index(self, data: pd.DataFrame):
+        """Build the prefix index over tool names and action phrases."""
+        tools = data['Tool'].astype(str).tolist()
+        actions = data['Action'].astype(str).tolist()
+        combined = [f"{tool} {action}" for tool, action in zip(tools, actions)]
+        self.suggest_index.build(tools + actions + combined)
+        self.popular_queries.reindex()
+    
+    def record_query(self, query: str):
+        """Count a past query; popular ones become suggestions."""
+        self.popular_queries.record(query)
+    
+    def suggest(self, prefix: str, limit: int = 8) -> List[str]:
+        """Return instant suggestions for a prefix without encoding."""
+        return self.suggest_index.suggest(prefix, limit)
+    
     def search(self, query: str, top_k: int = 5, threshold: float = 0.1) -> List[Dict[str, Any]]:
         """Perform semantic search."""
         if self.data is None or self.embeddings is None:
@@ -56,21 +280,53 @@ class SearchEngine:
         if not query or not query.strip():
             return []
         
+        with self._lock:
+            segments = [(self.embeddings, self.data, self._live)]
+            if len(self._delta):
+                delta_vectors, delta_live = self._delta.view()
+                segments.append((delta_vectors, self._delta_data, delta_live))
+        
         try:
             query_embedding = self.model.encode([query.strip()])
-            return self.search_strategy.search(
-                query_embedding, self.embeddings, self.data, top_k, threshold
-            )
+            results = []
+            for embeddings, data, live in segments:
+                if len(data):
+                    results.extend(self._search_segment(
+                        query_embedding, embeddings, data, live, top_k, threshold
+                    ))
+            
+            results.sort(key=lambda result: result['similarity'], reverse=True)
+            return results[:top_k]
             
         except Exception as e:
             print(f"Search error: {str(e)}")
             return []
     
+    def _search_segment(self, query_embedding: np.ndarray, embeddings: np.ndarray,
+                        data: pd.DataFrame, live: np.ndarray,
+                        top_k: int, threshold: float) -> List[Dict[str, Any]]:
+        """Search one index segment, excluding tombstoned rows."""
+        if live.all():
+            return self.search_strategy.search(query_embedding, embeddings, data, top_k, threshold)
+        
+        if 'mask' in inspect.signature(self.search_strategy.search).parameters:
+            return self.search_strategy.search(
+                query_embedding, embeddings, data, top_k, threshold, mask=live
+            )
+        
+        # Strategies without mask support only see live rows
+        rows = np.flatnonzero(live)
+        if not len(rows):
+            return []
+        return self.search_strategy.search(
+            query_embedding, embeddings[rows], data.iloc[rows], top_k, threshold
+        )
+    
     def get_status(self) -> Dict[str, Any]:
         """Get current status of the search engine."""
         return {
             'model_loaded': self.model is not None,
             'data_indexed': self.data is not None,
-            'record_count': len(self.data) if self.data is not None else 0,
+            'record_count': len(self._keys) if self.data is not None else 0,
             'embeddings_ready': self.embeddings is not None
         }
\ No newline at end of file
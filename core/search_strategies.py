@@ -3,7 +3,7 @@
 from abc import ABC, abstractmethod
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import pandas as pd
 
 
@@ -13,7 +13,11 @@ class SearchStrategy(ABC):
     @abstractmethod
     def search(self, query_embedding: np.ndarray, data_embeddings: np.ndarray, 
                data: pd.DataFrame, top_k: int, threshold: float) -> List[Dict[str, Any]]:
-        """Perform search using this strategy."""
+        """Perform search using this strategy.
+        
+        Strategies may also accept an optional ``mask`` keyword; rows whose
+        mask entry is False are deleted and must not be returned.
+        """
         pass
 
 
@@ -21,9 +25,12 @@ class CosineSimilarityStrategy(SearchStrategy):
     """Standard cosine similarity search strategy."""
     
     def search(self, query_embedding: np.ndarray, data_embeddings: np.ndarray, 
-               data: pd.DataFrame, top_k: int, threshold: float) -> List[Dict[str, Any]]:
+               data: pd.DataFrame, top_k: int, threshold: float,
+               mask: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
         """Search using cosine similarity."""
         similarities = cosine_similarity(query_embedding, data_embeddings)[0]
+        if mask is not None:
+            similarities = np.where(mask, similarities, -np.inf)
         top_indices = np.argsort(similarities)[::-1][:top_k]
         
         results = []
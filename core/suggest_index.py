@@ -0,0 +1,190 @@
+"""Prefix index for instant, encoder-free query suggestions."""
+
+import heapq
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def normalize_term(text: str) -> str:
+    """Collapse whitespace and lowercase text for prefix matching."""
+    return ' '.join(str(text).split()).lower()
+
+
+class PrefixIndex:
+    """Sorted-key prefix index over weighted suggestion terms.
+
+    A lookup binary searches the key range sharing the prefix and ranks the
+    whole range by weight, so suggestions never touch the sentence transformer
+    model. Ranked results for prefixes with large ranges are cached and kept
+    up to date as weights change.
+    """
+
+    def __init__(self, max_scan: int = 200, cache_size: int = 16):
+        self.max_scan = max_scan
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._keys: List[str] = []
+        self._terms: Dict[str, str] = {}
+        self._weights: Dict[str, float] = {}
+        self._top: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def build(self, terms: Iterable[str], weight: float = 1.0):
+        """Replace the index contents with the given terms."""
+        with self._lock:
+            self._terms = {}
+            self._weights = {}
+            self._top = {}
+            for term in terms:
+                self._register(term, weight)
+            self._keys = sorted(self._terms)
+
+    def add(self, term: str, weight: float = 1.0):
+        """Add a term, or increase its weight if it is already indexed."""
+        with self._lock:
+            key = self._register(term, weight)
+            if key is None:
+                return
+
+            pos = bisect_left(self._keys, key)
+            if pos == len(self._keys) or self._keys[pos] != key:
+                self._keys.insert(pos, key)
+
+            # A higher weight can only move the key up in cached rankings
+            for prefix in self._cached_prefixes(key):
+                ranked = self._top[prefix]
+                if key not in ranked:
+                    ranked.append(key)
+                ranked.sort(key=self._rank)
+                del ranked[self.cache_size:]
+
+    def remove(self, term: str, weight: Optional[float] = None):
+        """Decrease a term's weight, dropping it once the weight reaches zero.
+
+        Without a weight the term is removed entirely.
+        """
+        key = normalize_term(term)
+        with self._lock:
+            if key not in self._weights:
+                return
+
+            remaining = 0.0 if weight is None else self._weights[key] - weight
+            if remaining > 0:
+                self._weights[key] = remaining
+            else:
+                del self._weights[key]
+                del self._terms[key]
+                del self._keys[bisect_left(self._keys, key)]
+
+            # A lower weight may let an uncached key overtake this one
+            for prefix in self._cached_prefixes(key):
+                if key in self._top[prefix]:
+                    del self._top[prefix]
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[str]:
+        """Return the highest weighted terms starting with the prefix."""
+        key = normalize_term(prefix)
+        if not key or limit <= 0:
+            return []
+
+        with self._lock:
+            start, end = self._range(key)
+            if end - start <= self.max_scan or limit > self.cache_size:
+                ranked = heapq.nsmallest(limit, self._keys[start:end], key=self._rank)
+            else:
+                ranked = self._top.get(key)
+                if ranked is None:
+                    ranked = heapq.nsmallest(self.cache_size, self._keys[start:end], key=self._rank)
+                    self._top[key] = ranked
+
+            return [self._terms[k] for k in ranked[:limit]]
+
+    def _range(self, key: str) -> Tuple[int, int]:
+        """Return the slice of sorted keys that start with the given key."""
+        return bisect_left(self._keys, key), bisect_left(self._keys, key + '\U0010ffff')
+
+    def _cached_prefixes(self, key: str) -> List[str]:
+        """Return the prefixes of a key that have cached rankings."""
+        return [key[:i] for i in range(1, len(key) + 1) if key[:i] in self._top]
+
+    def _rank(self, key: str) -> Tuple[float, int, str]:
+        return -self._weights[key], len(key), key
+
+    def _register(self, term: str, weight: float) -> Optional[str]:
+        """Record display text and weight for a term, returning its key."""
+        display = ' '.join(str(term).split())
+        key = display.lower()
+        if not key or key == 'nan':
+            return None
+
+        self._terms.setdefault(key, display)
+        self._weights[key] = self._weights.get(key, 0.0) + weight
+        return key
+
+
+class PopularQueries:
+    """Counts past queries and promotes the most popular into a PrefixIndex.
+
+    A query becomes a suggestion only after it has been searched
+    ``min_count`` times, and at most ``max_promoted`` queries are promoted,
+    so one-off queries are never shown to other users and the index stays
+    bounded.
+    """
+
+    def __init__(self, index: PrefixIndex, min_count: int = 3, max_promoted: int = 500):
+        self.index = index
+        self.min_count = min_count
+        self.max_promoted = max_promoted
+        self.max_tracked = max_promoted * 20
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+        self._display: Dict[str, str] = {}
+        self._promoted = set()
+
+    def record(self, query: str):
+        """Count a query, promoting or reweighting it in the index."""
+        key = normalize_term(query)
+        if not key:
+            return
+
+        with self._lock:
+            count = self._counts.get(key, 0) + 1
+            self._counts[key] = count
+            self._display.setdefault(key, ' '.join(str(query).split()))
+
+            if key in self._promoted:
+                self.index.add(self._display[key])
+            elif count >= self.min_count:
+                self._promote(key)
+
+            if len(self._counts) > self.max_tracked:
+                self._prune()
+
+    def reindex(self):
+        """Re-add promoted queries after the index has been rebuilt."""
+        with self._lock:
+            for key in self._promoted:
+                self.index.add(self._display[key], self._counts[key])
+
+    def _promote(self, key: str):
+        """Add a query to the index, evicting the least popular if full."""
+        if len(self._promoted) >= self.max_promoted:
+            weakest = min(self._promoted, key=self._counts.__getitem__)
+            if self._counts[weakest] >= self._counts[key]:
+                return
+            self._promoted.discard(weakest)
+            self.index.remove(self._display[weakest], self._counts[weakest])
+
+        self._promoted.add(key)
+        self.index.add(self._display[key], self._counts[key])
+
+    def _prune(self):
+        """Forget the least counted unpromoted queries."""
+        candidates = [key for key in self._counts if key not in self._promoted]
+        candidates.sort(key=self._counts.__getitem__)
+        for key in candidates[:len(self._counts) - self.max_tracked // 2]:
+            del self._counts[key]
+            del self._display[key]
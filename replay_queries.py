@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Replay a captured query log against the search service and report latency.
+
+Examples:
+    python replay_queries.py logs/queries.jsonl
+    python replay_queries.py logs/queries.jsonl --speed 10 --concurrency 8
+    python replay_queries.py logs/queries.jsonl --url http://localhost:8080 --speed 0
+"""
+
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from core.query_log import read_query_log
+
+
+def create_in_process_target() -> Callable[[str, int], None]:
+    """Build a ChatbotService in this process and return its search call."""
+    from core.chatbot_service import ChatbotService
+    from config import AppConfig
+
+    config = AppConfig()
+    config.query_log.enabled = False
+    service = ChatbotService(config)
+    return lambda query, top_k: service.search(query, top_k)
+
+
+def create_http_target(url: str) -> Callable[[str, int], None]:
+    """Return a search call against a running instance's Gradio API.
+
+    The /search endpoint always returns the server's configured
+    max_results, so the logged top_k is ignored in this mode.
+    """
+    from gradio_client import Client
+
+    local = threading.local()
+
+    def search(query: str, top_k: int):
+        # gradio_client is not thread-safe, so each worker keeps its own client
+        if not hasattr(local, 'client'):
+            local.client = Client(url, verbose=False)
+        local.client.predict(query, [], api_name="/search")
+
+    return search
+
+
+def replay(entries: List[Dict], target: Callable[[str, int], None],
+           speed: float = 1.0, concurrency: int = 4) -> Dict[str, Any]:
+    """Replay entries at their original spacing divided by speed.
+
+    A speed of 0 sends queries back to back. Latency is measured from each
+    query's scheduled send time, so queueing behind slow requests is counted;
+    service time is measured from when a worker actually picks it up.
+    """
+    results = {'latency_ms': [], 'service_ms': [], 'errors': 0}
+    lock = threading.Lock()
+    first_ts = entries[0]['ts'] if entries else 0.0
+
+    def run(entry: Dict, scheduled: float):
+        started = time.perf_counter()
+        try:
+            target(entry['query'], entry.get('top_k', 5))
+            failed = False
+        except Exception as e:
+            print(f"Request error: {str(e)}")
+            failed = True
+        finished = time.perf_counter()
+
+        with lock:
+            if failed:
+                results['errors'] += 1
+            else:
+                results['latency_ms'].append((finished - scheduled) * 1000)
+                results['service_ms'].append((finished - started) * 1000)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for entry in entries:
+            offset = (entry['ts'] - first_ts) / speed if speed > 0 else 0.0
+            scheduled = start + offset
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(run, entry, max(scheduled, start))
+    results['elapsed_s'] = time.perf_counter() - start
+
+    return results
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def print_report(results: Dict[str, Any]):
+    """Print latency distribution and throughput."""
+    completed = len(results['latency_ms'])
+    elapsed = results['elapsed_s']
+
+    print("=" * 40)
+    print(f"Completed: {completed}  Errors: {results['errors']}  Elapsed: {elapsed:.2f}s")
+    print(f"Throughput: {completed / elapsed if elapsed > 0 else 0.0:.2f} queries/s")
+
+    for label, key in (("Latency", 'latency_ms'), ("Service time", 'service_ms')):
+        values = results[key]
+        mean = sum(values) / len(values) if values else 0.0
+        print(f"{label} (ms): mean={mean:.1f} "
+              f"p50={percentile(values, 50):.1f} p90={percentile(values, 90):.1f} "
+              f"p95={percentile(values, 95):.1f} p99={percentile(values, 99):.1f} "
+              f"max={max(values) if values else 0.0:.1f}")
+
+
+def warn_ignored_top_k(entries: List[Dict]):
+    """Warn when HTTP replay will not reproduce the logged top_k values."""
+    from config import SearchConfig
+
+    default = SearchConfig().max_results
+    differing = sum(1 for entry in entries if entry.get('top_k', default) != default)
+    if differing:
+        print(f"⚠️  {differing} logged queries used a top_k other than {default}; "
+              "--url replays them with the server's max_results")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a JSONL query log as a load test.")
+    parser.add_argument('log', help="Path to the JSONL query log")
+    parser.add_argument('--url', help="Base URL of a running instance (default: in-process service)")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="Replay speed multiplier; 0 sends queries as fast as possible")
+    parser.add_argument('--concurrency', type=int, default=4, help="Maximum requests in flight")
+    parser.add_argument('--limit', type=int, help="Replay only the first N queries")
+    args = parser.parse_args()
+
+    entries = read_query_log(args.log)
+    if args.limit:
+        entries = entries[:args.limit]
+    if not entries:
+        print(f"❌ No queries found in {args.log}")
+        sys.exit(1)
+
+    if args.url:
+        warn_ignored_top_k(entries)
+    target = create_http_target(args.url) if args.url else create_in_process_target()
+
+    print(f"🔁 Replaying {len(entries)} queries at {args.speed}x with concurrency {args.concurrency}")
+    print_report(replay(entries, target, args.speed, max(1, args.concurrency)))
+
+
+if __name__ == "__main__":
+    main()
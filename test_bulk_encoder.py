@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Checks for the bulk encoding pipeline (ordering and checkpoint resume)
+using a small hashing model instead of a downloaded sentence transformer
+"""
+
+import sys
+import os
+import tempfile
+import zlib
+
+import numpy as np
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import SearchConfig
+from core.bulk_encoder import BulkEncoder
+
+
+class HashingModel:
+    """Deterministic bag-of-words stand-in that can fail partway through."""
+
+    max_seq_length = 128
+    dimension = 32
+
+    def __init__(self, fail_on_call=None):
+        self.fail_on_call = fail_on_call
+        self.calls = 0
+        self.encoded = []
+
+    def get_sentence_embedding_dimension(self):
+        return self.dimension
+
+    def encode(self, texts, **kwargs):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise RuntimeError("simulated interruption")
+
+        self.encoded.extend(texts)
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for position, word in enumerate(text.split()):
+                vectors[i, zlib.crc32(word.encode('utf-8')) % self.dimension] += position + 1
+        return vectors
+
+
+def make_texts(count=23):
+    """Texts of mixed lengths, so sorting by length reorders them."""
+    return [' '.join(f"word{i}" for _ in range((i * 7) % 11 + 1)) + f" doc{i}"
+            for i in range(count)]
+
+
+def make_config(checkpoint_dir=None):
+    # A chunk size that does not divide the corpus size
+    return SearchConfig(encode_chunk_size=5, encode_checkpoint_dir=checkpoint_dir)
+
+
+def direct_encode(texts):
+    return HashingModel().encode(texts)
+
+
+def test_output_keeps_original_order():
+    texts = make_texts()
+    embeddings = BulkEncoder(HashingModel(), make_config()).encode(texts)
+
+    assert embeddings.dtype == np.float32
+    assert embeddings.shape == (len(texts), HashingModel.dimension)
+    assert np.array_equal(embeddings, direct_encode(texts))
+
+
+def test_resume_after_interruption():
+    texts = make_texts()
+
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        # Fail on the third chunk, after two chunks were checkpointed
+        failing = HashingModel(fail_on_call=3)
+        try:
+            BulkEncoder(failing, make_config(checkpoint_dir)).encode(texts)
+            raise AssertionError("interruption was not raised")
+        except RuntimeError:
+            pass
+        assert sorted(os.listdir(checkpoint_dir)) == ['embeddings.npy', 'progress.json']
+
+        resumed = HashingModel()
+        embeddings = BulkEncoder(resumed, make_config(checkpoint_dir)).encode(texts)
+
+        # Only the chunks that were not checkpointed are encoded again
+        assert len(resumed.encoded) == len(texts) - 10
+        assert not set(resumed.encoded) & set(failing.encoded)
+        assert np.array_equal(embeddings, direct_encode(texts))
+        assert os.listdir(checkpoint_dir) == []
+
+
+def test_checkpoint_for_other_corpus_is_ignored():
+    texts = make_texts()
+
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        try:
+            BulkEncoder(HashingModel(fail_on_call=2), make_config(checkpoint_dir)).encode(texts)
+        except RuntimeError:
+            pass
+
+        changed = texts[:-1] + ["a different last document"]
+        model = HashingModel()
+        embeddings = BulkEncoder(model, make_config(checkpoint_dir)).encode(changed)
+
+        assert len(model.encoded) == len(changed)
+        assert np.array_equal(embeddings, direct_encode(changed))
+        assert os.listdir(checkpoint_dir) == []
+
+
+if __name__ == "__main__":
+    print("🔍 Testing bulk encoding pipeline")
+    print("=" * 40)
+
+    for test in (test_output_keeps_original_order, test_resume_after_interruption,
+                 test_checkpoint_for_other_corpus_is_ignored):
+        test()
+        print(f"✅ {test.__name__}")
+
+    print("\n✅ Bulk encoding pipeline looks good!")
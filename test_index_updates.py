@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Checks for incremental index updates (upsert, delete and compaction)
+using a small hashing model instead of a downloaded sentence transformer
+"""
+
+import sys
+import os
+import threading
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import SearchConfig
+from core.search_engine import SearchEngine
+
+
+class HashingModel:
+    """Deterministic bag-of-words stand-in for SentenceTransformer."""
+
+    max_seq_length = 128
+    dimension = 64
+
+    def get_sentence_embedding_dimension(self):
+        return self.dimension
+
+    def encode(self, texts, **kwargs):
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[i, zlib.crc32(word.encode('utf-8')) % self.dimension] += 1.0
+        return vectors
+
+
+class HashingSearchEngine(SearchEngine):
+    """SearchEngine that uses the hashing model."""
+
+    def _load_model(self):
+        self.model = HashingModel()
+
+
+def make_records(rows):
+    """Build prepared records from (tool, action, summary) tuples."""
+    df = pd.DataFrame(rows, columns=['Tool', 'Action', 'Summary'])
+    df['Confluence Link'] = 'https://example.com/' + df['Tool']
+    df['searchable_text'] = df['Tool'] + ' ' + df['Action'] + ' ' + df['Summary']
+    return df
+
+
+def make_engine(count=20):
+    """Create an engine indexed with numbered records."""
+    config = SearchConfig(compaction_min_rows=1000000)
+    engine = HashingSearchEngine(config)
+    engine.index_data(make_records(
+        [(f"Tool{i}", f"action{i}", f"summary{i}") for i in range(count)]
+    ))
+    return engine
+
+
+def assert_consistent(engine):
+    """Exactly one live row per key, and every key maps to its own row."""
+    base_size = len(engine.data)
+    delta_vectors, delta_live = engine._delta.view()
+    live = np.concatenate([engine._live, delta_live])
+    rows = pd.concat([engine.data, engine._delta_data], ignore_index=True)
+
+    live_keys = list(zip(rows['Tool'][live], rows['Action'][live]))
+    assert len(live_keys) == len(set(live_keys)), "duplicate live rows for a key"
+    assert set(live_keys) == set(engine._keys), "live rows and key map disagree"
+
+    for key, row in engine._keys.items():
+        assert live[row], f"{key} maps to a dead row"
+        assert (rows['Tool'][row], rows['Action'][row]) == key, f"{key} maps to the wrong row"
+
+    assert engine._dead == int((~live).sum()), "dead row count is wrong"
+    assert len(delta_vectors) == len(engine._delta_data), "delta rows and vectors disagree"
+    assert engine.get_status()['record_count'] == len(engine._keys)
+    assert base_size == len(engine.embeddings)
+
+
+def top_summary(engine, query):
+    results = engine.search(query, top_k=1, threshold=0.0)
+    return results[0]['summary'] if results else None
+
+
+def test_upsert_and_delete():
+    engine = make_engine()
+
+    assert engine.upsert(make_records([("Tool3", "action3", "replaced three"),
+                                       ("New", "thing", "brand new")])) == 2
+    assert engine.delete([("Tool5", "action5"), ("Missing", "key")]) == 1
+    assert_consistent(engine)
+
+    assert top_summary(engine, "replaced three") == "replaced three"
+    assert top_summary(engine, "brand new") == "brand new"
+    assert all(r['summary'] != "summary5" for r in engine.search("summary5", 20, 0.0))
+    assert engine.get_status()['record_count'] == 20
+
+    engine.compact()
+    assert_consistent(engine)
+    assert len(engine.data) == 20 and len(engine._delta) == 0 and engine._dead == 0
+    assert top_summary(engine, "replaced three") == "replaced three"
+
+
+def test_writes_during_compaction():
+    engine = make_engine()
+    engine.upsert(make_records([("Tool1", "action1", "first update")]))
+    engine.delete([("Tool2", "action2")])
+
+    # Pause compaction after its snapshot, while it builds the new arrays
+    snapshot_taken = threading.Event()
+    resume = threading.Event()
+    record_keys = engine._record_keys
+
+    def paused_record_keys(data):
+        if threading.current_thread().name == "compaction-test":
+            snapshot_taken.set()
+            resume.wait(5)
+        return record_keys(data)
+
+    engine._record_keys = paused_record_keys
+    compaction = threading.Thread(target=engine.compact, name="compaction-test")
+    compaction.start()
+    assert snapshot_taken.wait(5)
+
+    engine.upsert(make_records([("Tool1", "action1", "second update"),
+                                ("Tool4", "action4", "updated four"),
+                                ("Late", "insert", "late insert"),
+                                ("Gone", "soon", "gone soon")]))
+    engine.delete([("Tool6", "action6"), ("Gone", "soon")])
+
+    resume.set()
+    compaction.join(5)
+    engine._record_keys = record_keys
+
+    assert_consistent(engine)
+    assert top_summary(engine, "second update") == "second update"
+    assert top_summary(engine, "late insert") == "late insert"
+    assert ("Tool6", "action6") not in engine._keys
+    assert ("Gone", "soon") not in engine._keys
+    assert ("Tool2", "action2") not in engine._keys
+    assert engine.get_status()['record_count'] == 19
+
+    engine.compact()
+    assert_consistent(engine)
+    assert len(engine.data) == 19 and engine._dead == 0
+
+
+def test_deleted_records_are_not_suggested():
+    engine = make_engine()
+    assert engine.suggest("tool7") == ["Tool7", "Tool7 action7"]
+
+    engine.delete([("Tool7", "action7")])
+    assert engine.suggest("tool7") == []
+
+    engine.upsert(make_records([("Tool7", "action7", "back again")]))
+    assert engine.suggest("tool7") == ["Tool7", "Tool7 action7"]
+
+
+def test_delete_during_upsert_is_not_suggested():
+    engine = make_engine()
+
+    # Pause the upsert while it adds suggestions and delete the same key
+    adding = threading.Event()
+    resume = threading.Event()
+    deleted = threading.Event()
+    add_suggestions = engine._add_suggestions
+
+    def paused_add_suggestions(data):
+        adding.set()
+        resume.wait(5)
+        add_suggestions(data)
+
+    def delete_fresh():
+        engine.delete([("Fresh", "tool")])
+        deleted.set()
+
+    engine._add_suggestions = paused_add_suggestions
+    upsert = threading.Thread(
+        target=engine.upsert, args=(make_records([("Fresh", "tool", "fresh tool")]),)
+    )
+    upsert.start()
+    assert adding.wait(5)
+
+    delete = threading.Thread(target=delete_fresh)
+    delete.start()
+    assert not deleted.wait(0.2), "delete ran before the upsert finished"
+
+    resume.set()
+    upsert.join(5)
+    delete.join(5)
+    engine._add_suggestions = add_suggestions
+
+    assert_consistent(engine)
+    assert ("Fresh", "tool") not in engine._keys
+    assert engine.suggest("fresh") == []
+
+
+if __name__ == "__main__":
+    print("🔍 Testing incremental index updates")
+    print("=" * 40)
+
+    for test in (test_upsert_and_delete, test_writes_during_compaction,
+                 test_deleted_records_are_not_suggested,
+                 test_delete_during_upsert_is_not_suggested):
+        test()
+        print(f"✅ {test.__name__}")
+
+    print("\n✅ Incremental index updates look good!")
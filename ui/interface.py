@@ -1,7 +1,7 @@
 """Gradio UI interface module."""
 
 import gradio as gr
-from typing import Tuple, List
+from typing import Dict, Tuple, List
 from .styles import CUSTOM_CSS
 from config import UIConfig
 
@@ -67,10 +67,23 @@ class ChatInterface:
                 scale=1,
                 size="lg"
             )
+        suggestions = gr.Radio(
+            choices=[],
+            label="Suggestions",
+            show_label=False,
+            visible=False,
+            elem_classes=["suggestions"]
+        )
+        
+        # Instant suggestions are served from the prefix index, never the model
+        msg.input(self._handle_suggest, msg, suggestions,
+                  queue=False, show_progress="hidden")
+        suggestions.select(self._handle_suggestion_select, None, [msg, suggestions], queue=False)
         
         # Connect input handlers
-        msg.submit(self._handle_submit, [msg, chatbot_ui], [chatbot_ui, msg])
-        submit_btn.click(self._handle_submit, [msg, chatbot_ui], [chatbot_ui, msg])
+        outputs = [chatbot_ui, msg, suggestions]
+        msg.submit(self._handle_submit, [msg, chatbot_ui], outputs, api_name="search")
+        submit_btn.click(self._handle_submit, [msg, chatbot_ui], outputs, api_name=False)
     
     def _create_examples(self):
         """Create the examples section."""
@@ -84,10 +97,26 @@ class ChatInterface:
             elem_classes=["examples"]
         )
     
-    def _handle_submit(self, message: str, history: List) -> Tuple[List, str]:
+    def _handle_suggest(self, message: str):
+        """Update the suggestion list for the current input prefix."""
+        choices = self.chatbot_service.suggest(message)
+        return gr.update(choices=choices, value=None, visible=bool(choices))
+    
+    def _handle_suggestion_select(self, evt: gr.SelectData) -> Tuple[str, Dict]:
+        """Copy the selected suggestion into the query textbox and hide the list."""
+        return evt.value, self._hidden_suggestions()
+    
+    def _handle_submit(self, message: str, history: List) -> Tuple[List, str, Dict]:
         """Handle user input submission."""
         if message and message.strip():
             response = self.chatbot_service.search(message.strip())
             history.append([message.strip(), response])
         
-        return history, ""
\ No newline at end of file
+        # Clearing the textbox programmatically does not fire .input,
+        # so the suggestion list is hidden here
+        return history, "", self._hidden_suggestions()
+    
+    @staticmethod
+    def _hidden_suggestions() -> Dict:
+        """Update that empties and hides the suggestion list."""
+        return gr.update(choices=[], value=None, visible=False)
\ No newline at end of file
@@ -34,4 +34,10 @@ CUSTOM_CSS = """
     padding: 16px !important;
     margin-top: 16px !important;
 }
+
+.suggestions {
+    border: 1px dashed #c4b5fd !important;
+    border-radius: 6px !important;
+    padding: 4px 8px !important;
+}
 """
\ No newline at end of file